@@ -2,70 +2,503 @@
 import os
 import sys
 import argparse
-import math
+import json
+import mimetypes
+import queue
+import subprocess
+import threading
+import time
+from collections import namedtuple
+from functools import lru_cache
+from concurrent.futures import CancelledError, ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
+import httpx
+import openai
 from openai import OpenAI
 from dotenv import load_dotenv
-from pydub import AudioSegment
+from tenacity import Retrying, retry_if_exception_type, stop_after_attempt, stop_when_event_set, wait_random_exponential
 import re
 
-def generate_output_filename(output_dir="transcripts"):
-    """日時を含む一意のファイル名を生成する"""
+# 環境変数を読み込む（.env の読み込みはモジュール読み込み時に一度だけ行う）
+load_dotenv()
+OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
+
+def generate_output_filename(output_dir="transcripts", source_path=None):
+    """
+    日時を含む一意のファイル名を生成する
+    source_path を指定した場合は元ファイル名も含める
+
+    Args:
+        output_dir (str): 出力ディレクトリ
+        source_path (str, optional): 文字起こしする音声ファイルのパス
+
+    Returns:
+        str: 出力ファイルのパス
+    """
     # 出力ディレクトリが存在しない場合は作成
     Path(output_dir).mkdir(parents=True, exist_ok=True)
 
     # 現在の日時を含むファイル名を生成
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    return os.path.join(output_dir, f"transcript_{timestamp}.txt")
+    prefix = f"transcript_{Path(source_path).stem}" if source_path else "transcript"
+    output_file = os.path.join(output_dir, f"{prefix}_{timestamp}.txt")
 
-def split_audio(audio_file_path, max_duration=1250):
+    # 同じ秒に生成された既存ファイルを上書きしないよう連番を付ける
+    counter = 1
+    while os.path.exists(output_file):
+        output_file = os.path.join(output_dir, f"{prefix}_{timestamp}_{counter}.txt")
+        counter += 1
+    return output_file
+
+# ストリームコピーのままパイプに出力できる拡張子と ffmpeg のフォーマット名
+STREAM_COPY_FORMATS = {".mp3": "mp3", ".flac": "flac", ".ogg": "ogg", ".webm": "webm"}
+
+# 分割位置の前に無音区間を探す範囲（秒）
+SILENCE_SEARCH_WINDOW = 15
+
+# 無音とみなす音量と最小の長さ
+SILENCE_NOISE_LEVEL = "-30dB"
+SILENCE_MIN_DURATION = 0.5
+
+# 文字起こし API にアップロードできるファイルサイズの上限（バイト）
+API_MAX_FILE_SIZE = 25 * 1024 * 1024
+
+# 切り出すセグメントの範囲（start が None の場合は元ファイルをそのまま使う）
+Segment = namedtuple("Segment", ["index", "start", "duration", "stream_copy"])
+
+def run_ffmpeg_tool(command, **kwargs):
+    """
+    ffmpeg / ffprobe を実行する
+    コマンド自体が見つからない場合は、音声ファイルが見つからないエラーと区別できるよう RuntimeError にする
+    並列実行される ffmpeg が端末のキー入力を読まないよう、標準入力は閉じておく
+
+    Args:
+        command (list): 実行するコマンドと引数
+        **kwargs: subprocess.run に渡す引数
+
+    Returns:
+        subprocess.CompletedProcess: 実行結果
     """
-    音声ファイルを指定された最大時間（秒）で分割する
+    try:
+        return subprocess.run(command, check=True, capture_output=True, stdin=subprocess.DEVNULL, **kwargs)
+    except FileNotFoundError as e:
+        raise RuntimeError(
+            f"{command[0]} が見つかりません。ffmpeg をインストールし、PATH を通してください。"
+        ) from e
+
+def get_audio_duration(audio_file_path):
+    """ffprobe で音声ファイルの長さ（秒）を取得する（デコードはしない）"""
+    try:
+        output = run_ffmpeg_tool(
+            [
+                "ffprobe", "-v", "error",
+                "-print_format", "json",
+                "-show_format",
+                audio_file_path,
+            ],
+            text=True,
+            errors="replace",
+        ).stdout
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(
+            f"ffprobe で '{audio_file_path}' を読み込めませんでした: {e.stderr.strip()}"
+        ) from e
+
+    try:
+        return float(json.loads(output)["format"]["duration"])
+    except (KeyError, ValueError) as e:
+        raise RuntimeError(f"'{audio_file_path}' の長さを取得できませんでした") from e
+
+def detect_silences(audio_file_path, start, duration):
+    """
+    ffmpeg の silencedetect フィルタで指定範囲内の無音区間を検出する
+    指定範囲だけをデコードするため、ファイル全体を読む必要はない
 
     Args:
         audio_file_path (str): 音声ファイルへのパス
+        start (float): 検出を始める位置（秒）
+        duration (float): 検出する長さ（秒）
+
+    Returns:
+        list: 無音区間の中点（ファイル先頭からの秒）のリスト
+    """
+    stderr = run_ffmpeg_tool(
+        [
+            "ffmpeg", "-hide_banner", "-nostats",
+            "-ss", str(start), "-t", str(duration),
+            "-i", audio_file_path,
+            "-vn", "-af", f"silencedetect=noise={SILENCE_NOISE_LEVEL}:d={SILENCE_MIN_DURATION}",
+            "-f", "null", "-",
+        ],
+        text=True,
+        errors="replace",
+    ).stderr
+
+    # 時刻は切り出し位置からの相対値なので start を足す
+    # 範囲の終わりまで無音が続いている場合は範囲の終わりを無音の終わりとみなす
+    starts = [start + float(t) for t in re.findall(r"silence_start: (-?[\d.]+)", stderr)]
+    ends = [start + float(t) for t in re.findall(r"silence_end: (-?[\d.]+)", stderr)]
+    ends += [start + duration] * (len(starts) - len(ends))
+    return [(silence_start + silence_end) / 2 for silence_start, silence_end in zip(starts, ends)]
+
+def find_split_points(total_duration, max_duration, find_silences, window=SILENCE_SEARCH_WINDOW):
+    """
+    各セグメントが max_duration を超えないように分割位置を決める
+    目標位置の手前 window 秒以内に無音区間があればその中点で分割し、
+    なければ目標位置でそのまま分割する
+
+    Args:
+        total_duration (float): 音声全体の長さ（秒）
         max_duration (int): 分割する最大時間（秒）
+        find_silences (callable): (開始位置, 長さ) を受け取り、その範囲の無音区間の中点（秒）のリストを返す関数
+        window (float): 無音区間を探す範囲（秒）
+
+    Returns:
+        list: 分割位置（秒）のリスト
+    """
+    if max_duration <= 0:
+        raise ValueError(f"max_duration は正の値である必要があります: {max_duration}")
+
+    split_points = []
+    last = 0.0
+    while total_duration - last > max_duration:
+        target = last + max_duration
+        window_start = max(last, target - window)
+        silences = find_silences(window_start, target - window_start)
+        candidates = [t for t in silences if window_start < t <= target]
+        split = max(candidates) if candidates else target
+        split_points.append(split)
+        last = split
+    return split_points
+
+def extract_segment(audio_file_path, start, duration, stream_copy):
+    """
+    ffmpeg で音声ファイルの一部を切り出し、メモリ上のバイト列として返す
+
+    Args:
+        audio_file_path (str): 音声ファイルへのパス
+        start (float): 切り出し開始位置（秒）
+        duration (float, optional): 切り出す長さ（秒）。None の場合は末尾まで。
+        stream_copy (bool): True の場合は再エンコードせずにコピーする
 
     Returns:
-        list: 一時的に作成された分割ファイルのパスのリスト
+        bytes: 切り出した音声データ
     """
-    print(f"音声ファイルを {max_duration} 秒ごとに分割しています...")
+    if stream_copy:
+        output_format = STREAM_COPY_FORMATS[Path(audio_file_path).suffix.lower()]
+        codec_args = ["-c:a", "copy"]
+    else:
+        output_format = "mp3"
+        codec_args = ["-c:a", "libmp3lame", "-b:a", "128k"]
+
+    duration_args = ["-t", str(duration)] if duration is not None else []
+
+    return run_ffmpeg_tool(
+        [
+            "ffmpeg", "-hide_banner", "-loglevel", "error",
+            "-ss", str(start), *duration_args,
+            "-i", audio_file_path,
+            "-vn", *codec_args,
+            "-f", output_format,
+            "pipe:1",
+        ]
+    ).stdout
+
+def split_audio(audio_file_path, max_duration=1250):
+    """
+    音声ファイルを指定された最大時間（秒）以内で、無音区間を境に分割する
+    分割位置だけを決め、音声データの切り出しは load_segment で必要になった時に行う
+
+    Args:
+        audio_file_path (str): 音声ファイルへのパス
+        max_duration (int): 分割する最大時間（秒）
 
-    # 音声ファイルを読み込む
-    audio = AudioSegment.from_file(audio_file_path)
+    Returns:
+        list: Segment のリスト
+    """
+    if not os.path.exists(audio_file_path):
+        raise FileNotFoundError(audio_file_path)
 
-    # 分割数を計算
-    total_duration = len(audio) / 1000  # ミリ秒から秒に変換
-    num_segments = math.ceil(total_duration / max_duration)
+    total_duration = get_audio_duration(audio_file_path)
+    file_size = os.path.getsize(audio_file_path)
 
-    if num_segments <= 1:
+    # 時間もサイズも API の上限内であれば分割せずにそのまま送る
+    if total_duration <= max_duration and file_size < API_MAX_FILE_SIZE:
         print("音声ファイルは分割の必要がありません。")
-        return [audio_file_path]
+        return [Segment(0, None, None, False)]
+
+    print(f"音声ファイルを最大 {max_duration} 秒ごとに分割しています...")
+
+    # 分割位置の手前だけを調べ、無音区間を境に分割位置を決める（見つからない場合は固定長で分割）
+    split_points = find_split_points(
+        total_duration,
+        max_duration,
+        lambda start, duration: detect_silences(audio_file_path, start, duration),
+    )
+    starts = [0.0] + split_points
+    ends = split_points + [None]
+
+    # 再エンコードせずに分割し、失敗した場合のみ MP3 に再エンコードする
+    # ビットレートが高くコピーではセグメントがサイズ上限を超える場合も再エンコードする
+    if total_duration > max_duration:
+        estimated_segment_size = file_size / total_duration * max_duration
+    else:
+        estimated_segment_size = file_size
+    stream_copy = (
+        Path(audio_file_path).suffix.lower() in STREAM_COPY_FORMATS
+        and estimated_segment_size < API_MAX_FILE_SIZE
+    )
+
+    segments = [
+        Segment(i, start, end - start if end is not None else None, stream_copy)
+        for i, (start, end) in enumerate(zip(starts, ends))
+    ]
+    print(f"{len(segments)} 個のセグメントに分割します")
+    return segments
+
+def load_segment(audio_file_path, segment):
+    """
+    セグメントの音声データをメモリ上に読み込む
+
+    Args:
+        audio_file_path (str): 音声ファイルへのパス
+        segment (Segment): split_audio が返すセグメント
+
+    Returns:
+        tuple: (ファイル名, 音声データ) のタプル
+    """
+    if segment.start is None:
+        with open(audio_file_path, "rb") as audio_file:
+            return (os.path.basename(audio_file_path), audio_file.read())
+
+    stream_copy = segment.stream_copy
+    try:
+        data = extract_segment(audio_file_path, segment.start, segment.duration, stream_copy)
+    except subprocess.CalledProcessError as e:
+        if not stream_copy:
+            raise RuntimeError(f"ffmpeg による分割に失敗しました: {e.stderr.decode(errors='replace')}") from e
+        print(f"セグメント {segment.index+1} のストリームコピーでの分割に失敗したため、MP3 に再エンコードします...")
+        stream_copy = False
+        data = extract_segment(audio_file_path, segment.start, segment.duration, stream_copy)
+
+    ext = Path(audio_file_path).suffix.lower() if stream_copy else ".mp3"
+    print(f"セグメント {segment.index+1} を作成しました ({segment.start:.1f}秒〜, {len(data) / 1024 / 1024:.1f} MB)")
+    return (f"segment_{segment.index:03d}{ext}", data)
+
+# 文字起こし API の最大試行回数
+MAX_TRANSCRIBE_ATTEMPTS = 5
+
+def log_retry(retry_state):
+    """リトライ前に待機時間と原因を表示する"""
+    print(
+        f"文字起こしに失敗しました ({retry_state.outcome.exception()})。"
+        f"{retry_state.next_action.sleep:.1f} 秒後に再試行します "
+        f"({retry_state.attempt_number}/{MAX_TRANSCRIBE_ATTEMPTS})..."
+    )
+
+def transcribe_segment(client, segment, model="gpt-4o-transcribe", cancel_event=None):
+    """
+    1つのセグメントを文字起こしする
+    レート制限や一時的な通信エラーの場合は指数バックオフで再試行する
+    cancel_event がセットされると、待機中の再試行を打ち切って CancelledError を送出する
+
+    Args:
+        client (OpenAI): OpenAI クライアント
+        segment (tuple): split_audio が返す (ファイル名, 音声データ) のタプル
+        model (str): 文字起こしに使うモデル
+        cancel_event (threading.Event, optional): 中断を通知するイベント
+
+    Returns:
+        str: 文字起こし結果のテキスト
+    """
+    if cancel_event is None:
+        cancel_event = threading.Event()
+
+    retrying = Retrying(
+        stop=stop_after_attempt(MAX_TRANSCRIBE_ATTEMPTS) | stop_when_event_set(cancel_event),
+        wait=wait_random_exponential(min=1, max=60),
+        retry=retry_if_exception_type((
+            openai.RateLimitError,
+            openai.APIConnectionError,
+            openai.APITimeoutError,
+            openai.InternalServerError,
+        )),
+        before_sleep=log_retry,
+        # 待機中に中断された場合はすぐに起きる
+        sleep=cancel_event.wait,
+        reraise=True,
+    )
+
+    name, data = segment
+    content_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+    for attempt in retrying:
+        with attempt:
+            if cancel_event.is_set():
+                raise CancelledError()
+            transcription = client.audio.transcriptions.create(
+                model=model,
+                file=(name, data, content_type),
+                language="ja"
+            )
+    return transcription.text
+
+@lru_cache(maxsize=None)
+def get_client(max_connections=5):
+    """
+    OpenAI クライアントを作成する（同じ接続数なら同じインスタンスを再利用する）
+    並列リクエストが少ないソケットで多重化されるよう HTTP/2 と keep-alive を有効にする
+    再試行は transcribe_segment の tenacity のみで行うため、SDK 側の再試行は無効にする
 
-    # 一時ファイルを保存するディレクトリ
-    temp_dir = Path("temp_audio_segments")
-    temp_dir.mkdir(exist_ok=True)
+    Args:
+        max_connections (int): コネクションプールの最大接続数
 
-    # 分割ファイルのパスリスト
-    segment_paths = []
+    Returns:
+        OpenAI: OpenAI クライアント
+    """
+    http_client = openai.DefaultHttpxClient(
+        http2=True,
+        timeout=httpx.Timeout(600.0),
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+        ),
+    )
+    return OpenAI(http_client=http_client, max_retries=0)
+
+# 出力ファイルの書き込みバッファサイズ（バイト）
+OUTPUT_BUFFER_SIZE = 1 << 20
+
+class Transcriber:
+    """
+    OpenAI クライアントと設定を保持し、複数の音声ファイルを続けて文字起こしする
+    クライアント（HTTP コネクションプール）はインスタンスの生存期間中再利用される
+    """
 
-    for i in range(num_segments):
-        start_ms = i * max_duration * 1000
-        end_ms = min((i + 1) * max_duration * 1000, len(audio))
+    def __init__(self, concurrency=5, model="gpt-4o-transcribe", max_duration=1250):
+        """
+        Args:
+            concurrency (int): 同時に文字起こしするセグメント数の上限
+            model (str): 文字起こしに使うモデル
+            max_duration (int): 分割する最大時間（秒）
+        """
+        self.concurrency = concurrency
+        self.model = model
+        self.max_duration = max_duration
+        self.client = get_client(concurrency)
+
+    def transcribe_range(self, audio_file_path, segment, cancel_event):
+        """
+        セグメントを切り出して文字起こしする
+        ワーカースレッド内で呼ばれるため、同時にメモリ上にあるセグメントは concurrency 個までになる
+
+        Args:
+            audio_file_path (str): 音声ファイルへのパス
+            segment (Segment): split_audio が返すセグメント
+            cancel_event (threading.Event): 中断を通知するイベント
+
+        Returns:
+            str: 文字起こし結果のテキスト
+        """
+        if cancel_event.is_set():
+            raise CancelledError()
+        data = load_segment(audio_file_path, segment)
+        return transcribe_segment(self.client, data, self.model, cancel_event)
+
+    def transcribe(self, audio_file_path, output_file=None):
+        """
+        音声ファイルを文字起こしして結果をファイルに書き込む
+        長い音声ファイルは自動的に分割して処理する
+
+        Args:
+            audio_file_path (str): 音声ファイルへのパス
+            output_file (str, optional): 出力ファイルのパス。指定しない場合は自動生成。
+
+        Returns:
+            str: 出力ファイルのパス
+
+        Raises:
+            RuntimeError: 文字起こしに失敗したセグメントがある場合（結果ファイルは書き込み済み）
+        """
+        # 出力ファイルのパスを決定
+        if output_file is None:
+            output_file = generate_output_filename(source_path=audio_file_path)
+
+        print(f"文字起こし中: {audio_file_path}")
+        print(f"出力ファイル: {output_file}")
+
+        failed_segments = []
 
-        segment = audio[start_ms:end_ms]
+        # 音声ファイルを分割
+        segments = split_audio(audio_file_path, self.max_duration)
 
-        # 一時ファイルのパス
-        segment_path = temp_dir / f"segment_{i}.mp3"
-        segment.export(segment_path, format="mp3")
-        segment_paths.append(str(segment_path))
+        # ファイルを開く（ジョブ全体で同じハンドルを使い、UTF-8 のバイト列をバッファ経由で書き込む）
+        with open(output_file, 'wb', buffering=OUTPUT_BUFFER_SIZE) as f:
+            # ヘッダーを書き込む
+            header = (
+                f"# 文字起こし結果\n"
+                f"# 元ファイル: {os.path.basename(audio_file_path)}\n"
+                f"# 日時: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+                f"# モデル: {self.model}\n\n"
+                f"\n===== {self.model} =====\n\n"
+            )
+            f.write(header.encode('utf-8'))
+
+            full_transcription = ""
+
+            # 各セグメントを並列に文字起こし
+            print(f"{len(segments)} 個のセグメントを最大 {self.concurrency} 並列で文字起こし中...")
+            cancel_event = threading.Event()
+            executor = ThreadPoolExecutor(max_workers=self.concurrency)
+            try:
+                futures = [
+                    executor.submit(self.transcribe_range, audio_file_path, segment, cancel_event)
+                    for segment in segments
+                ]
+
+                # 結果はセグメントの順番通りに受け取る
+                for i, future in enumerate(futures):
+                    try:
+                        text = future.result()
+                    except Exception as e:
+                        # 失敗したセグメントはスキップして残りの処理を続ける
+                        print(f"エラー: セグメント {i+1}/{len(segments)} の文字起こしに失敗しました: {e}")
+                        failed_segments.append(i + 1)
+                        text = f"[セグメント {i+1} の文字起こしに失敗しました]"
+                    else:
+                        print(f"セグメント {i+1}/{len(segments)} の文字起こしが完了しました")
+
+                    # 結果を追加
+                    full_transcription += text + "\\n\\n"
+
+                    # 結果を整形してファイルに書き込む
+                    formatted_text = re.sub(r'([。！？.])', r'\\1\\n', text)
+                    f.write((formatted_text + "\\n").encode('utf-8')) # 改行を追加したテキストを書き込む
+            except BaseException:
+                # Ctrl+C などで中断された場合は、未実行のセグメントを取り消し、
+                # 実行中のセグメントにも再試行をやめるよう通知する
+                # （送信中の HTTP リクエスト自体は完了かタイムアウトまで待つ）
+                cancel_event.set()
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+            executor.shutdown()
+
+            # すべてのセグメントを書き込んだ後に一度だけディスクへ書き出す
+            f.flush()
+            os.fsync(f.fileno())
 
-        print(f"セグメント {i+1}/{num_segments} を作成しました: {segment_path}")
+        # コンソールにも表示
+        print("\n===== 文字起こし完了 =====\n")
+        print(f"\n文字起こし結果をファイル '{output_file}' に保存しました。")
+
+        if failed_segments:
+            raise RuntimeError(
+                f"{len(failed_segments)} 個のセグメントで文字起こしに失敗しました: {failed_segments}"
+            )
 
-    return segment_paths
+        return output_file
 
-def transcribe_with_models(audio_file_path, output_file=None, max_duration=1250):
+def transcribe_with_models(audio_file_path, output_file=None, max_duration=1250, concurrency=5):
     """
     指定された音声ファイルを複数のOpenAIモデルで文字起こしする
     長い音声ファイルは自動的に分割して処理する
@@ -74,77 +507,28 @@ def transcribe_with_models(audio_file_path, output_file=None, max_duration=1250)
         audio_file_path (str): 音声ファイルへのパス
         output_file (str, optional): 出力ファイルのパス。指定しない場合は自動生成。
         max_duration (int): 分割する最大時間（秒）
+        concurrency (int): 同時に文字起こしするセグメント数の上限
 
     Returns:
         int: 成功時は0、エラー時は1
     """
-    # 環境変数を読み込む
-    load_dotenv()
-
     # OpenAI APIキーを確認
-    if not os.getenv("OPENAI_API_KEY"):
+    if not OPENAI_API_KEY:
         print("エラー: OPENAI_API_KEYが設定されていません。.envファイルを確認してください。")
         return 1
 
-    # 出力ファイルのパスを決定
-    if output_file is None:
-        output_file = generate_output_filename()
+    transcriber = Transcriber(concurrency=concurrency, max_duration=max_duration)
+    return run_transcription(transcriber, audio_file_path, output_file)
 
-    print(f"文字起こし中: {audio_file_path}")
-    print(f"出力ファイル: {output_file}")
-
-    # OpenAI クライアントの初期化
-    client = OpenAI()
+def run_transcription(transcriber, audio_file_path, output_file=None):
+    """
+    Transcriber で1つのファイルを文字起こしし、エラーを表示して終了コードを返す
 
+    Returns:
+        int: 成功時は0、エラー時は1
+    """
     try:
-        # 音声ファイルを分割
-        segment_paths = split_audio(audio_file_path, max_duration)
-
-        # ファイルを開く
-        with open(output_file, 'w', encoding='utf-8') as f:
-            # ヘッダーを書き込む
-            f.write(f"# 文字起こし結果\n")
-            f.write(f"# 元ファイル: {os.path.basename(audio_file_path)}\n")
-            f.write(f"# 日時: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"# モデル: gpt-4o-transcribe\n\n")
-            f.write("\n===== gpt-4o-transcribe =====\n\n")
-            f.flush()  # ファイルに即時書き込み
-
-        full_transcription = ""
-
-        # 各セグメントを文字起こし
-        for i, segment_path in enumerate(segment_paths):
-            print(f"セグメント {i+1}/{len(segment_paths)} を文字起こし中...")
-
-            # 音声ファイルを開いて文字起こし
-            with open(segment_path, "rb") as audio_file:
-                transcription = client.audio.transcriptions.create(
-                    model="gpt-4o-transcribe",
-                    file=audio_file,
-                    language="ja"
-                )
-
-                # 結果を追加
-                full_transcription += transcription.text + "\\n\\n"
-
-                # 結果を整形してファイルに書き込む
-                formatted_text = re.sub(r'([。！？.])', r'\\1\\n', transcription.text)
-                with open(output_file, 'a', encoding='utf-8') as f:
-                    f.write(formatted_text + "\\n") # 改行を追加したテキストを書き込む
-                    f.flush()
-
-        # 一時ファイルを削除（オリジナルファイルは除く）
-        if len(segment_paths) > 1:
-            print("一時ファイルを削除しています...")
-            for path in segment_paths:
-                if path != audio_file_path:
-                    os.remove(path)
-            os.rmdir("temp_audio_segments")
-
-        # コンソールにも表示
-        print("\n===== 文字起こし完了 =====\n")
-        print(f"\n文字起こし結果をファイル '{output_file}' に保存しました。")
-
+        transcriber.transcribe(audio_file_path, output_file)
     except FileNotFoundError:
         print(f"エラー: ファイル '{audio_file_path}' が見つかりません。")
         return 1
@@ -154,28 +538,127 @@ def transcribe_with_models(audio_file_path, output_file=None, max_duration=1250)
 
     return 0
 
+# 監視モードで文字起こし対象とする拡張子
+AUDIO_EXTENSIONS = {".mp3", ".mp4", ".mpeg", ".mpga", ".m4a", ".wav", ".webm", ".flac", ".ogg"}
+
+def wait_for_file_ready(path, interval=1.0):
+    """ファイルサイズが変化しなくなるまで（書き込みが終わるまで）待つ"""
+    previous_size = -1
+    size = os.path.getsize(path)
+    while size != previous_size:
+        time.sleep(interval)
+        previous_size = size
+        size = os.path.getsize(path)
+
+def watch_directory(transcriber, watch_dir, output_dir="transcripts"):
+    """
+    ディレクトリを監視し、追加された音声ファイルを順番に文字起こしする
+    Ctrl+C で終了するまで同じ Transcriber（クライアント）を使い続ける
+
+    Args:
+        transcriber (Transcriber): 文字起こしに使う Transcriber
+        watch_dir (str): 監視するディレクトリ
+        output_dir (str): 出力ディレクトリ
+
+    Returns:
+        int: 終了コード
+    """
+    # watchdog は監視モードでのみ必要なので、ここで読み込む
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+
+    if not os.path.isdir(watch_dir):
+        print(f"エラー: ディレクトリ '{watch_dir}' が見つかりません。")
+        return 1
+
+    pending = queue.Queue()
+
+    class AudioFileHandler(FileSystemEventHandler):
+        def enqueue(self, path):
+            if Path(path).suffix.lower() in AUDIO_EXTENSIONS:
+                pending.put(path)
+
+        def on_created(self, event):
+            if not event.is_directory:
+                self.enqueue(event.src_path)
+
+        def on_moved(self, event):
+            # 一時ファイル名で書き込んでからリネームするツールに対応する
+            if not event.is_directory:
+                self.enqueue(event.dest_path)
+
+    observer = Observer()
+    observer.schedule(AudioFileHandler(), watch_dir)
+    observer.start()
+    print(f"ディレクトリ '{watch_dir}' を監視しています... (Ctrl+C で終了)")
+
+    try:
+        while True:
+            audio_file_path = pending.get()
+            try:
+                wait_for_file_ready(audio_file_path)
+            except FileNotFoundError:
+                continue
+            output_file = generate_output_filename(output_dir, audio_file_path)
+            run_transcription(transcriber, audio_file_path, output_file)
+    except KeyboardInterrupt:
+        print("\n監視を終了します。")
+    finally:
+        observer.stop()
+        observer.join()
+
+    return 0
+
+def positive_int(value):
+    """argparse 用: 1 以上の整数だけを受け付ける"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"整数を指定してください: {value}")
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"1 以上の整数を指定してください: {value}")
+    return number
+
 def main():
     """
     メイン関数
     """
     # コマンドライン引数の処理
     parser = argparse.ArgumentParser(description="OpenAIモデルによる音声認識")
-    parser.add_argument("audio_file", help="文字起こしする音声ファイルのパス")
+    parser.add_argument("audio_file", nargs="?", help="文字起こしする音声ファイルのパス")
     parser.add_argument("-o", "--output", help="出力ファイルのパス (指定しない場合は自動生成)")
     parser.add_argument("--output-dir", default="transcripts", help="出力ディレクトリ (デフォルト: transcripts)")
-    parser.add_argument("--max-duration", type=int, default=1250, help="分割する最大時間（秒）(デフォルト: 1250)")
+    parser.add_argument("--max-duration", type=positive_int, default=1250, help="分割する最大時間（秒）(デフォルト: 1250)")
+    parser.add_argument("--concurrency", type=positive_int, default=5, help="同時に文字起こしするセグメント数 (デフォルト: 5)")
+    parser.add_argument("--watch", metavar="DIR", help="ディレクトリを監視し、追加された音声ファイルを文字起こしする")
 
     args = parser.parse_args()
 
+    if args.audio_file is None and args.watch is None:
+        parser.error("音声ファイルのパスか --watch のどちらかを指定してください")
+    if args.watch is not None and args.audio_file is not None:
+        parser.error("--watch と音声ファイルのパスは同時に指定できません")
+    if args.watch is not None and args.output is not None:
+        parser.error("--watch と -o/--output は同時に指定できません（出力先は --output-dir で指定してください）")
+
+    # OpenAI APIキーを確認
+    if not OPENAI_API_KEY:
+        print("エラー: OPENAI_API_KEYが設定されていません。.envファイルを確認してください。")
+        return 1
+
+    # クライアントは一度だけ作成し、すべてのファイルで使い回す
+    transcriber = Transcriber(concurrency=args.concurrency, max_duration=args.max_duration)
+
+    if args.watch is not None:
+        return watch_directory(transcriber, args.watch, args.output_dir)
+
     # 出力ファイルのパスを決定
     output_file = args.output
-    if output_file is None and args.output_dir != "transcripts":
-        # 出力ディレクトリが指定されている場合、そのディレクトリ内にファイルを生成
-        Path(args.output_dir).mkdir(parents=True, exist_ok=True)
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_file = os.path.join(args.output_dir, f"transcript_{timestamp}.txt")
+    if output_file is None:
+        # 出力ディレクトリ内に一意のファイル名を生成（監視モードと同じ命名規則）
+        output_file = generate_output_filename(args.output_dir, args.audio_file)
 
-    return transcribe_with_models(args.audio_file, output_file, args.max_duration)
+    return run_transcription(transcriber, args.audio_file, output_file)
 
 if __name__ == "__main__":
     sys.exit(main())